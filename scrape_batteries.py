@@ -11,15 +11,25 @@ import os
 import re
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Mapping
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 
-from bs4 import BeautifulSoup
+import lxml.html
 
 from scrape_battery import (
     CSV_COLUMNS,
     fetch_page,
     scrape_battery,
 )
+from scrape_product import (
+    DuplicatePage,
+    copy_duplicate_rows,
+    create_parse_pool,
+    enable_page_cache,
+    enable_session_reuse,
+    set_request_delay,
+)
 
 
 # URLs to exclude (services, not batteries)
@@ -31,119 +41,172 @@ EXCLUDED_URLS = {
     "https://robu.in/product/online-pcb-manufacturing-service",
 }
 
+# Product page URLs (excludes category pages and product sub-paths)
+PRODUCT_URL_RE = re.compile(r"https?://robu\.in/product/[^/]+/?$")
+
 
 def extract_product_urls(html: str, base_url: str) -> list[str]:
     """Extract all product URLs from a listing page."""
-    soup = BeautifulSoup(html, "lxml")
+    doc = lxml.html.fromstring(html)
     product_urls = set()
 
-    # Strategy 1: Look for the main product grid ul
-    product_grid = soup.find("ul", class_=lambda c: c and "products" in c)
-    if product_grid:
-        links = product_grid.find_all("a", href=True)
-        for link in links:
-            href = link["href"]
-            if "robu.in/product/" in href and "/product-category/" not in href:
-                clean_url = href.rstrip("/")
-                if clean_url not in EXCLUDED_URLS:
-                    product_urls.add(clean_url)
+    # Links inside the main product grid ul are trusted more
+    grid_hrefs = set(doc.xpath('(//ul[contains(@class, "products")])[1]//a/@href'))
+
+    # Each product is linked several times (image, title, button), so test
+    # every distinct href once
+    for href in set(doc.xpath("//a/@href")):
+        if href in grid_hrefs:
+            # Any product link in the grid, as long as it isn't a category page
+            is_product = "robu.in/product/" in href and "/product-category/" not in href
+        else:
+            # Elsewhere only plain product page URLs
+            is_product = PRODUCT_URL_RE.match(href) is not None
+        if is_product:
+            product_urls.add(href.rstrip("/"))
+
+    return sorted(product_urls - EXCLUDED_URLS)
+
+
+def fetch_listing_pages(listing_urls: list[str], max_workers: int = 4) -> set[str]:
+    """Fetch listing pages in parallel and collect the product URLs they link to."""
+    all_product_urls = set()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for url in listing_urls:
+            print(f"Fetching listing page: {url}")
+
+        pages = executor.map(fetch_page, listing_urls)
+        for listing_url, html in zip(listing_urls, pages):
+            if not html:
+                print(f"Failed to fetch listing page: {listing_url}")
+                continue
 
-    # Strategy 2: Find all links matching product pattern (fallback)
-    all_links = soup.find_all("a", href=True)
-    for link in all_links:
-        href = link["href"]
-        # Match product URLs but exclude category pages
-        if re.match(r"https?://robu\.in/product/[^/]+/?$", href):
-            clean_url = href.rstrip("/")
-            if clean_url not in EXCLUDED_URLS:
-                product_urls.add(clean_url)
+            product_urls = extract_product_urls(html, listing_url)
+            print(f"Found {len(product_urls)} product URLs from {listing_url}")
+            all_product_urls.update(product_urls)
 
-    return sorted(product_urls)
+    return all_product_urls
+
+
+def csv_needs_header(csv_path: str) -> bool:
+    """Check whether the CSV is missing or blank, so a header must be written."""
+    try:
+        with open(csv_path, "r", encoding="utf-8", newline="") as f:
+            # Only the first non-blank line matters, not the whole file
+            return all(not line.strip() for line in f)
+    except FileNotFoundError:
+        return True
 
 
-def append_to_csv(csv_path: str, data: list[dict]):
-    """Append data to CSV file, creating if it doesn't exist."""
-    file_exists = os.path.exists(csv_path)
+def append_to_csv(csv_path: str, data: list[Mapping[str, str]], write_header: bool):
+    """Append data to CSV file, writing the header first if asked to.
 
-    has_content = False
-    if file_exists:
-        with open(csv_path, "r", encoding="utf-8") as f:
-            has_content = bool(f.read().strip())
+    With write_header the file is blank (see csv_needs_header()), so it is
+    overwritten to keep the header on the first line.
+    """
+    rows = [[row.get(col, "") for col in CSV_COLUMNS] for row in data]
 
-    mode = "a" if file_exists and has_content else "w"
+    mode = "w" if write_header else "a"
+    # 1 MiB buffer so a whole batch goes out in a handful of write() calls
+    with open(csv_path, mode, newline="", encoding="utf-8", buffering=1 << 20) as f:
+        writer = csv.writer(f)
 
-    with open(csv_path, mode, newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        if write_header:
+            writer.writerow(CSV_COLUMNS)
 
-        if mode == "w" or not has_content:
-            writer.writeheader()
+        writer.writerows(rows)
 
-        for row in data:
-            row_data = {col: row.get(col, "") for col in CSV_COLUMNS}
-            writer.writerow(row_data)
 
+def get_existing_urls(csv_path: str, candidates: set | None = None) -> set:
+    """Get URLs already in the CSV to avoid duplicates.
 
-def get_existing_urls(csv_path: str) -> set:
-    """Get URLs already in the CSV to avoid duplicates."""
+    If candidates is given, only URLs from it are kept, so memory is bounded
+    by the current run instead of growing with the CSV.
+    """
     if not os.path.exists(csv_path):
         return set()
 
     urls = set()
     try:
-        with open(csv_path, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
+        with open(csv_path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            # Only the URL column is needed, so skip building a dict per row
+            url_index = next(reader).index("URL")
             for row in reader:
-                if "URL" in row:
-                    urls.add(row["URL"])
+                if len(row) > url_index:
+                    url = row[url_index]
+                    if candidates is None or url in candidates:
+                        urls.add(url)
     except Exception:
         pass
     return urls
 
 
-def scrape_products_parallel(urls: list[str], max_workers: int = 4, delay: float = 1.0) -> list[dict]:
-    """Scrape multiple products in parallel."""
+def scrape_battery_indexed(
+    url: str, index: int, parse_pool: Executor | None = None
+) -> tuple[int, str, Mapping[str, str] | None | Exception]:
+    """Run scrape_battery for the pool, returning the result (or raised error) with its position."""
+    try:
+        return index, url, scrape_battery(url, skip_duplicates=True, parse_pool=parse_pool)
+    except Exception as e:
+        return index, url, e
+
+
+def scrape_products_parallel(
+    urls: list[str], max_workers: int = 4, parse_processes: int = 0
+) -> list[Mapping[str, str]]:
+    """Scrape multiple products in parallel.
+
+    With parse_processes, the threads only fetch pages and hand them to a
+    process pool of that size for parsing, which the GIL would otherwise
+    serialise.
+    """
     results = []
+    duplicates: list[DuplicatePage] = []
     total = len(urls)
+    parse_pool_context = create_parse_pool(parse_processes) if parse_processes else nullcontext()
 
-    def scrape_with_delay(url: str, index: int):
-        if delay > 0:
-            time.sleep(delay * (index % max_workers))
-        return scrape_battery(url)
-
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_url = {
-            executor.submit(scrape_with_delay, url, i): (url, i)
+    with parse_pool_context as parse_pool, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(scrape_battery_indexed, url, i, parse_pool)
             for i, url in enumerate(urls)
-        }
+        ]
 
-        for future in as_completed(future_to_url):
-            url, index = future_to_url[future]
+        for future in as_completed(futures):
+            index, url, result = future.result()
             print(f"[{index + 1}/{total}] Processing: {url}")
-            try:
-                result = future.result()
-                if result:
-                    results.append(result)
-                    print(f"  ✓ [{index + 1}/{total}] {result.get('Product Name', 'Unknown')[:50]}")
-                else:
-                    print(f"  ✗ [{index + 1}/{total}] No data extracted")
-            except Exception as e:
-                print(f"  ✗ [{index + 1}/{total}] Error: {e}")
+            if isinstance(result, Exception):
+                print(f"  ✗ [{index + 1}/{total}] Error: {result}")
+            elif result:
+                results.append(result)
+                print(f"  ✓ [{index + 1}/{total}] {result.get('Product Name', 'Unknown')[:50]}")
+            elif isinstance(result, DuplicatePage):
+                duplicates.append(result)
+                print(f"  - [{index + 1}/{total}] Duplicate of {result.original_url}, skipped")
+            else:
+                print(f"  ✗ [{index + 1}/{total}] No data extracted")
 
+    copy_duplicate_rows(results, duplicates)
     return results
 
 
-def scrape_products_sequential(urls: list[str], delay: float = 1.0) -> list[dict]:
+def scrape_products_sequential(urls: list[str], delay: float = 1.0) -> list[Mapping[str, str]]:
     """Scrape products one by one (slower but more reliable)."""
     results = []
+    duplicates: list[DuplicatePage] = []
     total = len(urls)
 
     for i, url in enumerate(urls):
         print(f"[{i + 1}/{total}] Processing: {url}")
         try:
-            result = scrape_battery(url)
+            result = scrape_battery(url, skip_duplicates=True)
             if result:
                 results.append(result)
                 print(f"  ✓ {result.get('Product Name', 'Unknown')[:50]}")
+            elif isinstance(result, DuplicatePage):
+                duplicates.append(result)
+                print(f"  - Duplicate of {result.original_url}, skipped")
             else:
                 print(f"  ✗ No data extracted")
         except Exception as e:
@@ -152,6 +215,7 @@ def scrape_products_sequential(urls: list[str], delay: float = 1.0) -> list[dict
         if delay > 0 and i < total - 1:
             time.sleep(delay)
 
+    copy_duplicate_rows(results, duplicates)
     return results
 
 
@@ -189,8 +253,30 @@ def main():
         action="store_true",
         help="Use sequential scraping instead of parallel"
     )
+    parser.add_argument(
+        "--parse-processes", "-p",
+        type=int,
+        default=0,
+        help="Parse pages in this many worker processes (default: 0, parse in the fetching threads; not with --sequential)"
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        help="Cache fetched pages (gzipped) in this directory, so reruns skip the network"
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=3600,
+        help="Seconds a cached page stays fresh (default: 3600)"
+    )
 
     args = parser.parse_args()
+    if args.sequential and args.parse_processes:
+        parser.error("--parse-processes cannot be used with --sequential")
+
+    if args.cache_dir:
+        enable_page_cache(args.cache_dir, ttl=args.cache_ttl)
 
     # Collect URLs from arguments and file
     listing_urls = list(args.urls) if args.urls else []
@@ -212,17 +298,16 @@ def main():
         sys.exit(1)
 
     # Collect all product URLs from listing pages
-    all_product_urls = set()
-
-    for listing_url in listing_urls:
-        print(f"Fetching listing page: {listing_url}")
-        html = fetch_page(listing_url)
-        if html:
-            product_urls = extract_product_urls(html, listing_url)
-            print(f"Found {len(product_urls)} product URLs from {listing_url}")
-            all_product_urls.update(product_urls)
-        else:
-            print(f"Failed to fetch listing page: {listing_url}")
+    if args.sequential:
+        max_workers = 1
+    else:
+        # Pace requests across all workers instead of sleeping in each one,
+        # letting every worker start right away
+        max_workers = args.workers
+        set_request_delay(args.delay, burst=max_workers)
+    # Keep a pooled TCP/TLS connection alive for every worker
+    enable_session_reuse(pool_size=max_workers)
+    all_product_urls = fetch_listing_pages(listing_urls, max_workers=max_workers)
 
     if not all_product_urls:
         print("No product URLs found on the listing pages.")
@@ -232,7 +317,9 @@ def main():
     print(f"\nTotal unique product URLs: {len(product_urls)}")
 
     # Skip already scraped products
-    existing_urls = get_existing_urls(args.csv_file)
+    # Decided once up front; the CSV is only written at the end of the run
+    write_header = csv_needs_header(args.csv_file)
+    existing_urls = get_existing_urls(args.csv_file, candidates=all_product_urls)
     new_urls = [url for url in product_urls if url not in existing_urls]
     print(f"Skipping {len(existing_urls)} already scraped products")
     print(f"Scraping {len(new_urls)} new products...")
@@ -247,11 +334,13 @@ def main():
         results = scrape_products_sequential(new_urls, delay=args.delay)
     else:
         print(f"Using {args.workers} parallel workers with {args.delay}s delay")
-        results = scrape_products_parallel(new_urls, max_workers=args.workers, delay=args.delay)
+        results = scrape_products_parallel(
+            new_urls, max_workers=args.workers, parse_processes=args.parse_processes
+        )
 
     # Save results
     if results:
-        append_to_csv(args.csv_file, results)
+        append_to_csv(args.csv_file, results, write_header=write_header)
         print(f"\n✓ Saved {len(results)} products to {args.csv_file}")
     else:
         print("\n✗ No products scraped successfully")
@@ -6,11 +6,10 @@ Example: poetry run python scrape_battery.py "https://robu.in/product/3-7v-500ma
 """
 
 import argparse
-import json
 import re
 import sys
-
-from bs4 import BeautifulSoup
+from collections.abc import Mapping
+from concurrent.futures import Executor
 
 # Import shared functions from scrape_product
 from scrape_product import (
@@ -22,6 +21,11 @@ from scrape_product import (
     extract_stock_status,
     extract_general_info,
     extract_specification_table,
+    DuplicatePage,
+    enable_page_cache,
+    find_duplicate_page,
+    parse_html,
+    print_json,
 )
 
 
@@ -51,11 +55,43 @@ CSV_COLUMNS = [
     "Additional Specs",
 ]
 
-
-def scrape_battery(url: str, verbose: bool = False) -> dict | None:
-    """Scrape battery specifications from a product page."""
+# Columns that are a plain spec lookup: column -> (candidate keys, clean to a number).
+# Keys are lowercase to match the extracted spec keys and are tried in order.
+SPEC_LOOKUPS = {
+    "Model No.": (("model no", "model"), False),
+    "Nominal Voltage (V)": (("nominal voltage", "voltage"), True),
+    "Capacity (mAh)": (("nominal capacity", "capacity"), True),
+    "Continuous Charge Current": (("continuous charge current", "charge current"), False),
+    "Continuous Discharge Current": (("continuous dischg", "continuous discharge", "discharge current"), False),
+    "Max Charge Rate": (("max. charge rate", "max charge rate", "max. charge"), False),
+    "Max Discharge Rate": (("max discharge rate", "max. discharge", "max dischg"), False),
+    "Connector Type": (("connector type", "connector"), False),
+    "Life Cycles": (("life cycle", "cycle"), False),
+    "Application": (("application",), False),
+    "Shipping Weight (kg)": (("shipping weight",), False),
+    "Shipping Dimensions (cm)": (("shipping dimensions",), False),
+    "Additional Specs": (("additional spec",), False),
+}
+
+
+def scrape_battery(
+    url: str,
+    verbose: bool = False,
+    skip_duplicates: bool = False,
+    parse_pool: Executor | None = None,
+) -> Mapping[str, str] | None:
+    """Scrape battery specifications from a product page.
+
+    With skip_duplicates, pages identical to one already scraped in this
+    process return a DuplicatePage without being parsed. With parse_pool
+    (e.g. a ProcessPoolExecutor), the page is parsed there instead of in
+    the calling thread.
+    """
     clean_url = url.rstrip("/")
-    spec_url = f"{clean_url}/#tab-specification"
+    # The spec tab is in the page source already, and a #fragment is never sent
+    # to the server. The trailing slash matches WordPress' canonical URL, which
+    # saves a redirect.
+    spec_url = f"{clean_url}/"
     
     if verbose:
         print(f"Fetching: {clean_url}")
@@ -64,63 +100,78 @@ def scrape_battery(url: str, verbose: bool = False) -> dict | None:
     if not html:
         return None
 
-    soup = BeautifulSoup(html, "lxml")
+    original_url = find_duplicate_page(html, clean_url) if skip_duplicates else None
+    if original_url is not None:
+        if verbose:
+            print(f"Skipping duplicate of {original_url}: {clean_url}")
+        return DuplicatePage(clean_url, original_url)
+
+    if parse_pool is not None:
+        return parse_pool.submit(parse_battery, html, clean_url).result()
+    return parse_battery(html, clean_url)
+
+
+def parse_battery(html: str, url: str) -> dict[str, str] | None:
+    """Extract battery specifications from a fetched product page.
 
-    product_name = extract_product_name(soup)
+    Module-level so it can be handed to a process pool.
+    """
+    tree = parse_html(html)
+
+    product_name = extract_product_name(tree)
     if not product_name:
         return None
 
-    price = extract_price(soup)
-    stock_status = extract_stock_status(soup)
-
-    # Clean URL
-    clean_url = url.rstrip("/")
+    price = extract_price(tree)
+    stock_status = extract_stock_status(tree)
 
     # Extract specs from different sources
-    spec_table = extract_specification_table(soup)
-    general_info = extract_general_info(soup)
+    spec_table = extract_specification_table(tree)
+    general_info = extract_general_info(tree)
 
     # Merge all specs
     all_specs = {}
     all_specs.update(general_info)
     all_specs.update(spec_table)
 
-    def get_spec(*keys, clean: bool = True, exact: bool = False) -> str:
-        """Get a spec value by trying multiple possible keys."""
+    # Spec keys are already lowercased by the extractors
+    spec_items = list(all_specs.items())
+
+    # Most lookups want the numeric part, and some (dimensions, weight) revisit
+    # the same specs, so clean every value to a number once up front
+    spec_numbers = [clean_number(value) for _, value in spec_items]
+
+    def find_spec(key: str) -> int:
+        """Get the index of the first spec whose key contains `key`, or -1."""
+        return next((i for i, (spec_key, _) in enumerate(spec_items) if key in spec_key), -1)
+
+    def get_spec(*keys: str, clean: bool = True) -> str:
+        """Get a spec value by trying multiple possible (lowercase) keys."""
         for key in keys:
-            key_lower = key.lower()
-            # Try exact match first
-            for spec_key, value in all_specs.items():
-                if exact and spec_key == key_lower:
-                    return clean_number(value) if clean else clean_value(value)
-                elif not exact and key_lower in spec_key:
-                    return clean_number(value) if clean else clean_value(value)
+            index = find_spec(key)
+            if index != -1:
+                return spec_numbers[index] if clean else clean_value(spec_items[index][1])
         return ""
 
-    def get_weight():
+    def get_weight() -> str:
         """Get weight in grams."""
-        for spec_key, value in all_specs.items():
-            key_lower = spec_key.lower()
-            if "weight" in key_lower and "shipping" not in key_lower:
+        for (spec_key, _), num in zip(spec_items, spec_numbers):
+            if "weight" in spec_key and "shipping" not in spec_key:
                 # Return the value with units
-                num = clean_number(value)
                 if num:
                     return num
         return ""
 
     def get_dimension(dim_type: str) -> str:
         """Get a specific dimension (thickness/breadth/length)."""
-        for spec_key, value in all_specs.items():
-            if dim_type in spec_key.lower():
-                return clean_number(value)
-        return ""
+        return get_spec(dim_type)
 
     def get_full_dimensions() -> str:
         """Try to get full dimensions string."""
-        for spec_key, value in all_specs.items():
-            if "dimension" in spec_key.lower() and "shipping" not in spec_key.lower():
+        for spec_key, value in spec_items:
+            if "dimension" in spec_key and "shipping" not in spec_key:
                 # Skip individual dimensions
-                if any(x in spec_key.lower() for x in ["thickness", "breadth", "length", "width", "height"]):
+                if any(x in spec_key for x in ["thickness", "breadth", "length", "width", "height"]):
                     continue
                 return clean_value(value)
         # Build from individual dimensions
@@ -133,33 +184,23 @@ def scrape_battery(url: str, verbose: bool = False) -> dict | None:
 
     result = {
         "Product Name": product_name,
-        "URL": clean_url,
+        "URL": url,
         "Stock Status": stock_status,
         "Price (INR)": price,
-        "Model No.": get_spec("model no", "model", clean=False),
-        "Nominal Voltage (V)": get_spec("nominal voltage", "voltage"),
-        "Capacity (mAh)": get_spec("nominal capacity", "capacity"),
-        "Continuous Charge Current": get_spec("continuous charge current", "charge current", clean=False),
-        "Continuous Discharge Current": get_spec("continuous dischg", "continuous discharge", "discharge current", clean=False),
-        "Max Charge Rate": get_spec("max. charge rate", "max charge rate", "max. charge", clean=False),
-        "Max Discharge Rate": get_spec("max discharge rate", "max. discharge", "max dischg", clean=False),
-        "Connector Type": get_spec("connector type", "connector", clean=False),
-        "Life Cycles": get_spec("life cycle", "cycle", clean=False),
-        "Application": get_spec("application", clean=False),
         "Thickness (mm)": get_dimension("thickness"),
         "Breadth (mm)": get_dimension("breadth") or get_dimension("width"),
         "Length (mm)": get_dimension("length"),
         "Dimensions": get_full_dimensions(),
         "Weight (g)": get_weight(),
-        "Shipping Weight (kg)": get_spec("shipping weight", clean=False),
-        "Shipping Dimensions (cm)": get_spec("shipping dimensions", clean=False),
-        "Additional Specs": get_spec("additional spec", clean=False),
     }
+    for column, (keys, clean) in SPEC_LOOKUPS.items():
+        result[column] = get_spec(*keys, clean=clean)
 
-    return result
+    # Keep the CSV column order for printing and JSON output
+    return {column: result[column] for column in CSV_COLUMNS}
 
 
-def print_battery_specs(specs: dict) -> None:
+def print_battery_specs(specs: Mapping[str, str]) -> None:
     """Print battery specifications in a readable format."""
     if not specs:
         print("No specifications found.")
@@ -176,7 +217,7 @@ def print_battery_specs(specs: dict) -> None:
     print("=" * 60)
 
 
-def main():
+def main() -> None:
     parser = argparse.ArgumentParser(
         description="Scrape battery specifications from a robu.in product page"
     )
@@ -187,9 +228,21 @@ def main():
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Show verbose output"
     )
+    parser.add_argument(
+        "--cache-dir", help="Cache fetched pages (gzipped) in this directory"
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=3600,
+        help="Seconds a cached page stays fresh (default: 3600)",
+    )
 
     args = parser.parse_args()
 
+    if args.cache_dir:
+        enable_page_cache(args.cache_dir, ttl=args.cache_ttl)
+
     specs = scrape_battery(args.url, verbose=args.verbose)
 
     if not specs:
@@ -197,7 +250,7 @@ def main():
         sys.exit(1)
 
     if args.json:
-        print(json.dumps(specs, indent=2, ensure_ascii=False))
+        print_json(specs)
     else:
         print_battery_specs(specs)
 
@@ -11,14 +11,22 @@ import os
 import re
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Mapping
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 
-from bs4 import BeautifulSoup
+import lxml.html
 
 from scrape_product import (
     CSV_COLUMNS,
+    DuplicatePage,
+    copy_duplicate_rows,
+    create_parse_pool,
+    enable_page_cache,
+    enable_session_reuse,
     fetch_page,
     scrape_product,
+    set_request_delay,
 )
 
 
@@ -31,83 +39,121 @@ EXCLUDED_URLS = {
     "https://robu.in/product/online-pcb-manufacturing-service",
 }
 
+# Product page URLs (excludes category pages and product sub-paths)
+PRODUCT_URL_RE = re.compile(r"https?://robu\.in/product/[^/]+/?$")
+
 
 def extract_product_urls(html: str, base_url: str) -> list[str]:
     """Extract all product URLs from a listing page."""
-    soup = BeautifulSoup(html, "lxml")
+    doc = lxml.html.fromstring(html)
     product_urls = set()
 
-    # Strategy 1: Look for the main product grid ul
-    product_grid = soup.find("ul", class_=lambda c: c and "products" in c)
-    if product_grid:
-        links = product_grid.find_all("a", href=True)
-        for link in links:
-            href = link["href"]
-            if "robu.in/product/" in href and "/product-category/" not in href:
-                clean_url = href.rstrip("/")
-                if clean_url not in EXCLUDED_URLS:
-                    product_urls.add(clean_url)
+    # Links inside the main product grid ul are trusted more
+    grid_hrefs = set(doc.xpath('(//ul[contains(@class, "products")])[1]//a/@href'))
+
+    # Each product is linked several times (image, title, button), so test
+    # every distinct href once
+    for href in set(doc.xpath("//a/@href")):
+        if href in grid_hrefs:
+            # Any product link in the grid, as long as it isn't a category page
+            is_product = "robu.in/product/" in href and "/product-category/" not in href
+        else:
+            # Elsewhere only plain product page URLs
+            is_product = PRODUCT_URL_RE.match(href) is not None
+        if is_product:
+            product_urls.add(href.rstrip("/"))
+
+    return sorted(product_urls - EXCLUDED_URLS)
+
 
-    # Strategy 2: Find all links matching product pattern (fallback)
-    all_links = soup.find_all("a", href=True)
-    for link in all_links:
-        href = link["href"]
-        # Match product URLs but exclude category pages
-        if re.match(r"https?://robu\.in/product/[^/]+/?$", href):
-            clean_url = href.rstrip("/")
-            if clean_url not in EXCLUDED_URLS:
-                product_urls.add(clean_url)
+def fetch_listing_pages(listing_urls: list[str], max_workers: int = 5) -> set[str]:
+    """Fetch listing pages in parallel and collect the product URLs they link to."""
+    all_product_urls = set()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for url in listing_urls:
+            print(f"Fetching listing page: {url}")
 
-    return sorted(product_urls)
+        pages = executor.map(lambda url: fetch_page(url, verbose=True), listing_urls)
+        for listing_url, html in zip(listing_urls, pages):
+            if not html:
+                print(f"Failed to fetch listing page: {listing_url}")
+                continue
 
+            product_urls = extract_product_urls(html, listing_url)
+            print(f"Found {len(product_urls)} product URLs from {listing_url}")
+            all_product_urls.update(product_urls)
 
-def append_to_csv(csv_path: str, data: list[dict]):
-    """Append data to CSV file, creating if it doesn't exist."""
-    file_exists = os.path.exists(csv_path)
+    return all_product_urls
 
-    has_content = False
-    if file_exists:
-        with open(csv_path, "r", encoding="utf-8") as f:
-            has_content = bool(f.read().strip())
 
-    mode = "a" if file_exists and has_content else "w"
+def csv_needs_header(csv_path: str) -> bool:
+    """Check whether the CSV is missing or blank, so a header must be written."""
+    try:
+        with open(csv_path, "r", encoding="utf-8", newline="") as f:
+            # Only the first non-blank line matters, not the whole file
+            return all(not line.strip() for line in f)
+    except FileNotFoundError:
+        return True
+
 
-    with open(csv_path, mode, newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+def append_to_csv(csv_path: str, data: list[Mapping[str, str]], write_header: bool):
+    """Append data to CSV file, writing the header first if asked to.
 
-        if mode == "w" or not has_content:
-            writer.writeheader()
+    With write_header the file is blank (see csv_needs_header()), so it is
+    overwritten to keep the header on the first line.
+    """
+    rows = [[row.get(col, "") for col in CSV_COLUMNS] for row in data]
 
-        for row in data:
-            row_data = {col: row.get(col, "") for col in CSV_COLUMNS}
-            writer.writerow(row_data)
+    mode = "w" if write_header else "a"
+    # 1 MiB buffer so a whole batch goes out in a handful of write() calls
+    with open(csv_path, mode, newline="", encoding="utf-8", buffering=1 << 20) as f:
+        writer = csv.writer(f)
 
+        if write_header:
+            writer.writerow(CSV_COLUMNS)
 
-def get_existing_urls(csv_path: str) -> set:
-    """Get URLs already in the CSV to avoid duplicates."""
+        writer.writerows(rows)
+
+
+def get_existing_urls(csv_path: str, candidates: set | None = None) -> set:
+    """Get URLs already in the CSV to avoid duplicates.
+
+    If candidates is given, only URLs from it are kept, so memory is bounded
+    by the current run instead of growing with the CSV.
+    """
     if not os.path.exists(csv_path):
         return set()
 
     urls = set()
     try:
-        with open(csv_path, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
+        with open(csv_path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            # Only the URL column is needed, so skip building a dict per row
+            url_index = next(reader).index("URL")
             for row in reader:
-                if "URL" in row:
-                    urls.add(row["URL"])
+                if len(row) > url_index:
+                    url = row[url_index]
+                    if candidates is None or url in candidates:
+                        urls.add(url)
     except Exception:
         pass
     return urls
 
 
-def scrape_product_safe(url: str, index: int, total: int) -> dict | None:
+def scrape_product_safe(
+    url: str, index: int, total: int, parse_pool: Executor | None = None
+) -> Mapping[str, str] | None:
     """Wrapper for scrape_product with error handling for parallel execution."""
     print(f"[{index}/{total}] Processing: {url}")
     try:
-        data = scrape_product(url, verbose=False)
+        data = scrape_product(url, verbose=False, skip_duplicates=True, parse_pool=parse_pool)
         if data and data.get("Product Name"):
             print(f"  ✓ [{index}/{total}] {data.get('Product Name', 'Unknown')[:50]}")
             return data
+        elif isinstance(data, DuplicatePage):
+            print(f"  - [{index}/{total}] Duplicate of {data.original_url}, skipped")
+            return data
         else:
             print(f"  ✗ [{index}/{total}] No data extracted")
             return None
@@ -116,28 +162,35 @@ def scrape_product_safe(url: str, index: int, total: int) -> dict | None:
         return None
 
 
-def scrape_products_parallel(urls: list[str], max_workers: int = 5, delay: float = 0.5) -> list[dict]:
-    """Scrape multiple products in parallel using ThreadPoolExecutor."""
+def scrape_products_parallel(
+    urls: list[str], max_workers: int = 5, parse_processes: int = 0
+) -> list[Mapping[str, str]]:
+    """Scrape multiple products in parallel using ThreadPoolExecutor.
+
+    With parse_processes, the threads only fetch pages and hand them to a
+    process pool of that size for parsing, which the GIL would otherwise
+    serialise.
+    """
     scraped_data = []
+    duplicates: list[DuplicatePage] = []
     total = len(urls)
-    
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_url = {
-            executor.submit(scrape_product_safe, url, i + 1, total): url 
+    parse_pool_context = create_parse_pool(parse_processes) if parse_processes else nullcontext()
+
+    with parse_pool_context as parse_pool, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # scrape_product_safe reports its own progress and never raises
+        futures = [
+            executor.submit(scrape_product_safe, url, i + 1, total, parse_pool)
             for i, url in enumerate(urls)
-        }
-        
-        for future in as_completed(future_to_url):
-            url = future_to_url[future]
-            try:
-                result = future.result()
-                if result:
-                    scraped_data.append(result)
-            except Exception as e:
-                print(f"  ✗ Exception processing {url}: {e}")
-            
-            time.sleep(delay)
-    
+        ]
+
+        for future in as_completed(futures):
+            result = future.result()
+            if result:
+                scraped_data.append(result)
+            elif isinstance(result, DuplicatePage):
+                duplicates.append(result)
+
+    copy_duplicate_rows(scraped_data, duplicates)
     return scraped_data
 
 
@@ -177,8 +230,31 @@ def main():
         action="store_true",
         help="Use sequential scraping instead of parallel",
     )
+    parser.add_argument(
+        "--parse-processes",
+        "-p",
+        type=int,
+        default=0,
+        help="Parse pages in this many worker processes (default: 0, parse in the fetching threads; not with --sequential)",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        help="Cache fetched pages (gzipped) in this directory, so reruns skip the network",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=3600,
+        help="Seconds a cached page stays fresh (default: 3600)",
+    )
 
     args = parser.parse_args()
+    if args.sequential and args.parse_processes:
+        parser.error("--parse-processes cannot be used with --sequential")
+
+    if args.cache_dir:
+        enable_page_cache(args.cache_dir, ttl=args.cache_ttl)
 
     # Collect URLs from command line or file
     urls_to_scrape = []
@@ -201,51 +277,55 @@ def main():
         sys.exit(1)
 
     # Handle multiple URLs
-    all_product_urls = set()
-    
-    for listing_url in urls_to_scrape:
-        print(f"Fetching listing page: {listing_url}")
-        html = fetch_page(listing_url, verbose=True)
-        if not html:
-            print(f"Failed to fetch listing page: {listing_url}")
-            continue
-
-        product_urls = extract_product_urls(html, listing_url)
-        print(f"Found {len(product_urls)} product URLs from {listing_url}")
-        all_product_urls.update(product_urls)
-    
-    all_product_urls = sorted(all_product_urls)
+    if args.sequential:
+        max_workers = 1
+    else:
+        # Pace requests across all workers instead of sleeping in each one,
+        # letting every worker start right away
+        max_workers = args.workers
+        set_request_delay(args.delay, burst=max_workers)
+    # Keep a pooled TCP/TLS connection alive for every worker
+    enable_session_reuse(pool_size=max_workers)
+    all_product_urls = sorted(fetch_listing_pages(urls_to_scrape, max_workers=max_workers))
     print(f"\nTotal unique product URLs: {len(all_product_urls)}")
 
     if not all_product_urls:
         print("No products found!")
         sys.exit(1)
 
-    existing_urls = get_existing_urls(args.csv_file)
+    # Decided once up front; the CSV is only written at the end of the run
+    write_header = csv_needs_header(args.csv_file)
+    existing_urls = get_existing_urls(args.csv_file, candidates=set(all_product_urls))
     new_urls = [url for url in all_product_urls if url not in existing_urls]
     print(f"Skipping {len(all_product_urls) - len(new_urls)} already scraped products")
     print(f"Scraping {len(new_urls)} new products...")
 
     if args.sequential:
         scraped_data = []
+        duplicates: list[DuplicatePage] = []
         for i, url in enumerate(new_urls, 1):
             print(f"\n[{i}/{len(new_urls)}] Processing...")
             try:
-                data = scrape_product(url, verbose=True)
+                data = scrape_product(url, verbose=True, skip_duplicates=True)
                 if data and data.get("Product Name"):
                     scraped_data.append(data)
                     print(f"  ✓ {data.get('Product Name', 'Unknown')[:50]}")
+                elif isinstance(data, DuplicatePage):
+                    duplicates.append(data)
             except Exception as e:
                 print(f"  ✗ Error: {e}")
 
             if i < len(new_urls):
                 time.sleep(args.delay)
+        copy_duplicate_rows(scraped_data, duplicates)
     else:
         print(f"Using {args.workers} parallel workers with {args.delay}s delay")
-        scraped_data = scrape_products_parallel(new_urls, max_workers=args.workers, delay=args.delay)
+        scraped_data = scrape_products_parallel(
+            new_urls, max_workers=args.workers, parse_processes=args.parse_processes
+        )
 
     if scraped_data:
-        append_to_csv(args.csv_file, scraped_data)
+        append_to_csv(args.csv_file, scraped_data, write_header=write_header)
         print(f"\n✓ Saved {len(scraped_data)} products to {args.csv_file}")
     else:
         print("\nNo new data to save.")
@@ -1,17 +1,34 @@
 #!/usr/bin/env python3
 """
-Scrape specifications from a single robu.in product page.
-Usage: poetry run python scrape_product.py <product_url>
+Scrape specifications from one or more robu.in product pages.
+Usage: poetry run python scrape_product.py <product_url> [<product_url> ...]
 Example: poetry run python scrape_product.py "https://robu.in/product/my6812-100w-dc-motor"
 """
 
 import argparse
+import gzip
+import hashlib
+import json
+import multiprocessing
+import os
 import re
 import sys
+import threading
 import time
+import zlib
+from collections.abc import Iterator, Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
 
 import cloudscraper
-from bs4 import BeautifulSoup
+import lxml.etree
+import lxml.html
+from urllib3.util import Retry
+
+try:
+    import orjson
+except ImportError:  # optional, only speeds up --json output
+    orjson = None  # type: ignore[assignment]
 
 
 # Headers to mimic a browser request
@@ -55,8 +72,63 @@ CSV_COLUMNS = [
 ]
 
 
-def fetch_page(url: str, retries: int = 3, verbose: bool = False) -> str | None:
-    """Fetch a page with retries using cloudscraper to bypass protection."""
+class TokenBucket:
+    """Thread-safe rate limiter handing out one request slot per interval.
+
+    Up to `capacity` requests may go out back to back (e.g. one per worker
+    at startup) before the fixed rate kicks in.
+    """
+
+    def __init__(self, rate_per_sec: float, capacity: int = 1) -> None:
+        self.interval = 1.0 / rate_per_sec
+        self.burst = (capacity - 1) * self.interval
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic() - self.burst
+
+    def acquire(self) -> None:
+        """Block until this caller's request slot comes up."""
+        with self._lock:
+            now = time.monotonic()
+            # Idle time refills the bucket, but never beyond its capacity
+            slot = max(now - self.burst, self._next_slot)
+            self._next_slot = slot + self.interval
+        # Sleep outside the lock so other threads can reserve their slots
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# Shared by all worker threads, set via set_request_delay()
+_rate_limiter: TokenBucket | None = None
+
+
+def set_request_delay(delay: float, burst: int = 1) -> None:
+    """Space out all fetch_page requests by `delay` seconds, allowing `burst` at once."""
+    global _rate_limiter
+    _rate_limiter = TokenBucket(1.0 / delay, capacity=burst) if delay > 0 else None
+
+
+# Transient server errors are retried inside the connection pool with
+# exponential backoff (waits of 0, 1 and 2 s). Retry-After is not honored: it
+# has no upper bound and could park a worker thread for an hour. 503 and 429
+# are left out on purpose: cloudscraper treats both as Cloudflare challenge
+# statuses and must see them to solve the challenge. A 429 that survives that
+# goes through fetch_page()'s own paced loop instead. Connection and read
+# errors are also left to that loop, so a URL costs at most 1 + 3 requests for
+# these statuses and `retries` requests otherwise, never the product of the two.
+RETRY_POLICY = Retry(
+    total=3,
+    connect=0,
+    read=0,
+    backoff_factor=0.5,
+    status_forcelist=(500, 502, 504),
+    allowed_methods=frozenset(["GET"]),
+    respect_retry_after_header=False,
+    raise_on_status=False,
+)
+
+
+def create_scraper(pool_size: int = 10) -> cloudscraper.CloudScraper:
+    """Create a cloudscraper session keeping up to `pool_size` HTTPS connections alive."""
     scraper = cloudscraper.create_scraper(
         browser={
             'browser': 'chrome',
@@ -64,26 +136,197 @@ def fetch_page(url: str, retries: int = 3, verbose: bool = False) -> str | None:
             'mobile': False
         }
     )
-    
+    # Re-mount cloudscraper's TLS adapter with a pool big enough for every worker
+    scraper.mount(
+        "https://",
+        cloudscraper.CipherSuiteAdapter(
+            cipherSuite=scraper.cipherSuite,
+            ecdhCurve=scraper.ecdhCurve,
+            server_hostname=scraper.server_hostname,
+            source_address=scraper.source_address,
+            ssl_context=scraper.ssl_context,
+            pool_maxsize=pool_size,
+            max_retries=RETRY_POLICY,
+        ),
+    )
+    return scraper
+
+
+# Keep-alive session shared by every fetch_page call, see get_scraper()
+_shared_scraper: cloudscraper.CloudScraper | None = None
+_shared_scraper_lock = threading.Lock()
+
+
+def enable_session_reuse(pool_size: int) -> None:
+    """Replace the shared session with one pooling `pool_size` connections."""
+    global _shared_scraper
+    with _shared_scraper_lock:
+        _shared_scraper = create_scraper(pool_size)
+
+
+def get_scraper() -> cloudscraper.CloudScraper:
+    """Return the shared session, creating it with the default pool on first use."""
+    global _shared_scraper
+    if _shared_scraper is None:
+        with _shared_scraper_lock:
+            if _shared_scraper is None:
+                _shared_scraper = create_scraper()
+    return _shared_scraper
+
+
+# Where fetched pages are kept and for how long, set via enable_page_cache()
+_page_cache_dir: Path | None = None
+_page_cache_ttl: float = 0.0
+
+
+def enable_page_cache(cache_dir: str, ttl: float = 3600) -> None:
+    """Keep fetched pages gzipped under cache_dir, reusing them for ttl seconds."""
+    global _page_cache_dir, _page_cache_ttl
+    _page_cache_dir = Path(cache_dir)
+    _page_cache_dir.mkdir(parents=True, exist_ok=True)
+    _page_cache_ttl = ttl
+
+
+def page_cache_path(url: str) -> Path:
+    """Path of the cached copy of a page, named by a hash of its URL."""
+    assert _page_cache_dir is not None, "enable_page_cache() was not called"
+    return _page_cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.html.gz"
+
+
+def read_cached_page(url: str) -> str | None:
+    """Return the cached page for url if it is younger than the TTL."""
+    path = page_cache_path(url)
+    try:
+        if time.time() - path.stat().st_mtime > _page_cache_ttl:
+            return None
+        return gzip.decompress(path.read_bytes()).decode("utf-8")
+    except (OSError, EOFError, zlib.error, UnicodeDecodeError):
+        # Missing or damaged copies are just a cache miss
+        return None
+
+
+def write_cached_page(url: str, html: str) -> None:
+    """Store a fetched page in the cache."""
+    path = page_cache_path(url)
+    # Write then rename so other workers (and other runs sharing the cache
+    # dir) never read a partial file
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp_path.write_bytes(gzip.compress(html.encode("utf-8"), compresslevel=6))
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+def fetch_page(url: str, retries: int = 3, verbose: bool = False) -> str | None:
+    """Fetch a page with retries using cloudscraper to bypass protection.
+
+    With enable_page_cache(), fresh cached copies are returned without a request.
+    """
+    if _page_cache_dir is not None:
+        html = read_cached_page(url)
+        if html is not None:
+            if verbose:
+                print(f"  Using cached copy of {url}")
+            return html
+
+    scraper = get_scraper()
+
     for attempt in range(retries):
+        if _rate_limiter:
+            _rate_limiter.acquire()
         try:
             response = scraper.get(url, timeout=30)
             response.raise_for_status()
-            return response.text
+            # Decode with the charset from the headers rather than
+            # response.text, which runs charset detection when there is none
+            html = response.content.decode(response.encoding or "utf-8", errors="replace")
+            if _page_cache_dir is not None:
+                write_cached_page(url, html)
+            return html
         except Exception as e:
             if verbose:
                 print(f"  Attempt {attempt + 1}/{retries} failed: {e}")
+            response = getattr(e, "response", None)
+            if response is not None and response.status_code in RETRY_POLICY.status_forcelist:
+                # Already retried in the connection pool, see RETRY_POLICY
+                break
             if attempt < retries - 1:
                 time.sleep(2 ** attempt)  # Exponential backoff
     return None
 
 
+# Fingerprint of every page parsed so far in this process, mapped to the URL it
+# was first scraped from, see find_duplicate_page()
+_seen_pages: dict[tuple[int, int], str] = {}
+_seen_pages_lock = threading.Lock()
+
+
+def find_duplicate_page(html: str, url: str) -> str | None:
+    """Return the URL an identical page was already seen at in this process.
+
+    Different product URLs can redirect to the same page (e.g. renamed
+    slugs), so batch runs use this to skip parsing the copy. Returns None,
+    and remembers the page under url, if it was not seen before.
+    """
+    # The built-in (per-process salted) str hash runs over the decoded text in
+    # C, unlike a hashlib digest which would need an encoded copy of the page
+    digest = (hash(html), len(html))
+    with _seen_pages_lock:
+        original_url = _seen_pages.get(digest)
+        if original_url is None:
+            _seen_pages[digest] = url
+    return original_url
+
+
+class DuplicatePage(Mapping[str, str]):
+    """Returned by the scrapers for a page skipped by find_duplicate_page().
+
+    An empty (so falsy) read-only mapping like a failed scrape; check with
+    isinstance() to tell them apart.
+    """
+
+    def __init__(self, url: str, original_url: str) -> None:
+        self.url = url
+        self.original_url = original_url
+
+    def __getitem__(self, key: str) -> str:
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(())
+
+    def __len__(self) -> int:
+        return 0
+
+
+def copy_duplicate_rows(rows: list[Mapping[str, str]], duplicates: list[DuplicatePage]) -> None:
+    """Append a copy of the row each duplicate page was scraped into, under its own URL.
+
+    Writing them to the CSV lets the next run skip those URLs as already
+    scraped instead of fetching them again.
+    """
+    rows_by_url = {row["URL"]: row for row in rows}
+    for duplicate in duplicates:
+        row = rows_by_url.get(duplicate.original_url)
+        if row:
+            rows.append({**row, "URL": duplicate.url})
+
+
+# Leading number of a value, optionally after a comparison sign ("< 0.5 A")
+NUMBER_RE = re.compile(r"[<>~]?\s*([\d.]+)")
+
+
 def clean_number(text: str) -> str:
     """Extract numeric value from text."""
     if not text:
         return ""
     text = text.strip()
-    match = re.search(r"[<>~]?\s*([\d.]+)", text)
+    # Most values are already a bare number such as "12.5". isdecimal() accepts
+    # exactly the characters \d does, so the regex would return them unchanged.
+    if text.replace(".", "").isdecimal():
+        return text
+    match = NUMBER_RE.search(text)
     return match.group(1) if match else text
 
 
@@ -91,60 +334,109 @@ def clean_value(text: str) -> str:
     """Clean value by removing extra whitespace but keeping units."""
     if not text:
         return ""
-    # Replace multiple spaces with single space, strip leading/trailing
-    return re.sub(r'\s+', ' ', text.strip())
+    # Replace runs of whitespace with a single space, strip leading/trailing.
+    # str.split() uses the same whitespace definition as \s, without the regex.
+    return " ".join(text.split())
 
 
-def extract_price(soup: BeautifulSoup) -> str:
+def parse_html(html: str) -> lxml.html.HtmlElement:
+    """Parse a page once so every extractor can share the same tree."""
+    return lxml.html.document_fromstring(html)
+
+
+def has_class(class_name: str) -> str:
+    """XPath predicate matching elements whose class list contains class_name."""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {class_name} ")'
+
+
+def first(elements: list) -> lxml.html.HtmlElement | None:
+    """Return the first XPath result, or None if there are none."""
+    return elements[0] if elements else None
+
+
+# XPath expressions used by the extractors, compiled once at import
+TEXT_XPATH = lxml.etree.XPath(".//text()[not(parent::script or parent::style)]")
+PAGE_TEXT_XPATH = lxml.etree.XPath("//text()[not(parent::script or parent::style)]")
+PRICE_XPATH = lxml.etree.XPath(f"//p[{has_class('price')}]")
+PRODUCT_TITLE_XPATH = lxml.etree.XPath('//h1[contains(@class, "product_title")]')
+STOCK_XPATH = lxml.etree.XPath(
+    f"//div[{has_class('availability')}]"
+    f"//span[{has_class('electro-stock-availability')}]"
+    f"//p[{has_class('stock')}]"
+)
+SHORT_DESCRIPTION_XPATH = lxml.etree.XPath(f"//div[{has_class('woocommerce-product-details__short-description')}]")
+DESCRIPTION_TAB_XPATH = lxml.etree.XPath('//div[@id="tab-description"]')
+SUMMARY_XPATH = lxml.etree.XPath(f"//div[{has_class('summary')}]")
+ENTRY_SUMMARY_XPATH = lxml.etree.XPath(f"//div[{has_class('entry-summary')}]")
+DESCENDANT_LISTS_XPATH = lxml.etree.XPath(".//ol | .//ul")
+CHILD_LISTS_XPATH = lxml.etree.XPath("./ol | ./ul")
+GRANDCHILD_LISTS_XPATH = lxml.etree.XPath("./div/ol | ./div/ul")
+SPEC_TABLE_XPATH = lxml.etree.XPath(
+    '//table[contains(translate(@id, "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"), "specification")]'
+)
+SPEC_TAB_TABLE_XPATH = lxml.etree.XPath('(//div[@id="tab-specification"])[1]//table')
+ROW_COUNT_XPATH = lxml.etree.XPath("count(.//tr)")
+ROW_CELLS_XPATH = lxml.etree.XPath(".//td | .//th")
+ATTRIBUTE_ROWS_XPATH = lxml.etree.XPath('//tr[contains(@class, "woocommerce-product-attributes-item")]')
+ATTRIBUTE_LABEL_XPATH = lxml.etree.XPath(f".//th[{has_class('woocommerce-product-attributes-item__label')}]")
+ATTRIBUTE_VALUE_XPATH = lxml.etree.XPath(f".//td[{has_class('woocommerce-product-attributes-item__value')}]")
+
+
+def element_text(element: lxml.html.HtmlElement) -> str:
+    """Join the stripped text nodes under an element, skipping scripts and styles."""
+    return "".join(text.strip() for text in TEXT_XPATH(element))
+
+
+PRICE_RE = re.compile(r"[\d,]+\.?\d*")
+
+
+def extract_price(tree: lxml.html.HtmlElement) -> str:
     """Extract product price."""
-    price_elem = soup.find("p", class_="price")
-    if price_elem:
-        ins = price_elem.find("ins")
-        if ins:
-            amount = ins.find("bdi")
+    price_elem = first(PRICE_XPATH(tree))
+    if price_elem is not None:
+        ins = price_elem.find(".//ins")
+        if ins is not None:
+            amount = ins.find(".//bdi")
         else:
-            amount = price_elem.find("bdi")
-        if amount:
-            text = amount.get_text(strip=True)
-            match = re.search(r"[\d,]+\.?\d*", text.replace(",", ""))
+            amount = price_elem.find(".//bdi")
+        if amount is not None:
+            text = element_text(amount)
+            match = PRICE_RE.search(text.replace(",", ""))
             if match:
                 return match.group()
     return ""
 
 
-def extract_product_name(soup: BeautifulSoup) -> str:
+def extract_product_name(tree: lxml.html.HtmlElement) -> str:
     """Extract product name."""
-    title = soup.find("h1", class_=lambda c: c and "product_title" in c)
-    if title:
-        return title.get_text(strip=True)
-    title = soup.find("title")
-    if title:
-        return title.get_text(strip=True).split(" - ")[0].strip()
+    title = first(PRODUCT_TITLE_XPATH(tree))
+    if title is not None:
+        return element_text(title)
+    title = tree.find(".//title")
+    if title is not None:
+        return element_text(title).split(" - ")[0].strip()
     return ""
 
 
-def extract_stock_status(soup: BeautifulSoup) -> str:
+def extract_stock_status(tree: lxml.html.HtmlElement) -> str:
     """Extract stock availability status."""
     # Look for availability div
-    availability = soup.find("div", class_="availability")
-    if availability:
-        stock_span = availability.find("span", class_="electro-stock-availability")
-        if stock_span:
-            stock_p = stock_span.find("p", class_="stock")
-            if stock_p:
-                text = stock_p.get_text(strip=True)
-                # Normalize status
-                text_lower = text.lower()
-                if "out of stock" in text_lower:
-                    return "Out of Stock"
-                elif "in stock" in text_lower:
-                    return "In Stock"
-                elif "low" in text_lower or "order now" in text_lower:
-                    return "Low Stock"
-                return text
+    stock_p = first(STOCK_XPATH(tree))
+    if stock_p is not None:
+        text = element_text(stock_p)
+        # Normalize status
+        text_lower = text.lower()
+        if "out of stock" in text_lower:
+            return "Out of Stock"
+        elif "in stock" in text_lower:
+            return "In Stock"
+        elif "low" in text_lower or "order now" in text_lower:
+            return "Low Stock"
+        return text
     
-    # Fallback: search page text for stock status
-    page_text = soup.get_text().lower()
+    # Fallback: search page text for stock status. Only visible text counts,
+    # scripts and attributes can mention stock without meaning this product.
+    page_text = "".join(PAGE_TEXT_XPATH(tree)).lower()
     if "out of stock" in page_text:
         return "Out of Stock"
     elif "in stock" in page_text:
@@ -155,39 +447,34 @@ def extract_stock_status(soup: BeautifulSoup) -> str:
     return "Unknown"
 
 
-def extract_general_info(soup: BeautifulSoup) -> dict:
+def extract_general_info(tree: lxml.html.HtmlElement) -> dict:
     """Extract info from the general info div (ordered list)."""
     specs = {}
 
     # Find the main product content area, but exclude related products sections
     # Look for woocommerce-product-details__short-description or similar
-    description_div = soup.find("div", class_="woocommerce-product-details__short-description")
-    if not description_div:
-        description_div = soup.find("div", id="tab-description")
-    if not description_div:
+    description_div = first(SHORT_DESCRIPTION_XPATH(tree))
+    if description_div is None:
+        description_div = first(DESCRIPTION_TAB_XPATH(tree))
+    if description_div is None:
         # Try the main summary area
-        summary = soup.find("div", class_="summary")
-        if summary:
-            description_div = summary
+        description_div = first(SUMMARY_XPATH(tree))
 
     all_lists = []
-    if description_div:
-        all_lists.extend(description_div.find_all(["ol", "ul"]))
+    if description_div is not None:
+        all_lists.extend(DESCENDANT_LISTS_XPATH(description_div))
 
     # Also check for the product single entry summary
-    entry_summary = soup.find("div", class_="entry-summary")
-    if entry_summary:
+    entry_summary = first(ENTRY_SUMMARY_XPATH(tree))
+    if entry_summary is not None:
         # Be careful to only get lists in the actual product description, not related products
-        for ol in entry_summary.find_all(["ol", "ul"], recursive=False):
-            all_lists.append(ol)
+        all_lists.extend(CHILD_LISTS_XPATH(entry_summary))
         # Also check nested divs but not too deep
-        for child_div in entry_summary.find_all("div", recursive=False):
-            all_lists.extend(child_div.find_all(["ol", "ul"], recursive=False))
+        all_lists.extend(GRANDCHILD_LISTS_XPATH(entry_summary))
 
     for ol in all_lists:
-        items = ol.find_all("li")
-        for item in items:
-            text = item.get_text(strip=True)
+        for item in ol.iter("li"):
+            text = element_text(item)
             if ":" in text:
                 parts = text.split(":", 1)
                 if len(parts) == 2:
@@ -200,91 +487,89 @@ def extract_general_info(soup: BeautifulSoup) -> dict:
     return specs
 
 
-def extract_specification_table(soup: BeautifulSoup) -> dict:
+def extract_specification_table(tree: lxml.html.HtmlElement) -> dict:
     """Extract specs from the specification table."""
     specs = {}
 
-    spec_table = soup.find("table", id=lambda x: x and "specification" in x.lower() if x else False)
-    if not spec_table:
-        spec_div = soup.find("div", id="tab-specification")
-        if spec_div:
-            spec_table = spec_div.find("table")
-
-    if not spec_table:
-        tables = soup.find_all("table")
-        for table in tables:
-            rows = table.find_all("tr")
-            if len(rows) > 3:
+    spec_table = first(SPEC_TABLE_XPATH(tree))
+    if spec_table is None:
+        spec_table = first(SPEC_TAB_TABLE_XPATH(tree))
+
+    if spec_table is None:
+        for table in tree.iter("table"):
+            if ROW_COUNT_XPATH(table) > 3:
                 spec_table = table
                 break
 
-    if spec_table:
-        rows = spec_table.find_all("tr")
-        for row in rows:
-            cells = row.find_all(["td", "th"])
+    if spec_table is not None:
+        for row in spec_table.iter("tr"):
+            cells = ROW_CELLS_XPATH(row)
             if len(cells) >= 2:
-                key = cells[0].get_text(strip=True).lower()
-                value = cells[1].get_text(strip=True)
+                key = element_text(cells[0]).lower()
+                value = element_text(cells[1])
                 # Clean up key - remove trailing colons and extra spaces
                 key = key.rstrip(":").strip()
                 if key and value:
                     specs[key] = value
 
     # Also look for product attributes table (for shipping weight, dimensions, etc.)
-    product_attrs = soup.find_all("tr", class_=lambda c: c and "woocommerce-product-attributes-item" in c)
+    product_attrs = ATTRIBUTE_ROWS_XPATH(tree)
     for row in product_attrs:
-        th = row.find("th", class_="woocommerce-product-attributes-item__label")
-        td = row.find("td", class_="woocommerce-product-attributes-item__value")
-        if th and td:
-            key = th.get_text(strip=True).lower()
-            value = td.get_text(strip=True)
+        th = first(ATTRIBUTE_LABEL_XPATH(row))
+        td = first(ATTRIBUTE_VALUE_XPATH(row))
+        if th is not None and td is not None:
+            key = element_text(th).lower()
+            value = element_text(td)
             if key and value:
                 specs[key] = value
 
     return specs
 
 
-def extract_via_regex(html: str) -> dict:
-    """Extract specifications using regex patterns on entire page."""
+# Patterns for extract_via_regex(), tried in order per spec. They are lowercase
+# and run on the lowercased page: one lowered copy is far cheaper than
+# re.IGNORECASE, which turns off re's fast literal search.
+REGEX_SPEC_PATTERNS = {
+    "weight_kg": [
+        re.compile(r"weight\s*[:\(]?\s*(\d+\.?\d*)\s*kg"),
+        re.compile(r"(\d+\.?\d*)\s*kg\s*weight"),
+    ],
+    "shipping_weight": [
+        re.compile(r"shipping\s*weight\s*[:\s]*(\d+\.?\d*)\s*kg"),
+    ],
+    "shipping_dimensions": [
+        re.compile(r"shipping\s*dimensions?\s*[:\s]*([\d.]+\s*[×x]\s*[\d.]+\s*[×x]\s*[\d.]+)\s*cm"),
+    ],
+    # Note: Voltage/Power/RPM regex removed - too many false positives from related products
+    # Rely on spec_table extraction instead
+    "rated_current": [
+        re.compile(r"rated?\s*current\s*[:\(]?\s*[<>]?\s*(\d+\.?\d*)\s*a"),
+    ],
+    "no_load_current": [
+        re.compile(r"no\s*load\s*current\s*[:\(]?\s*[<>]?\s*(\d+\.?\d*)\s*a"),
+    ],
+    "rated_torque": [
+        re.compile(r"rated?\s*torque\s*[:\(]?\s*(\d+\.?\d*)\s*(?:kg[.-]?cm|n\.?m)"),
+    ],
+    "stall_torque": [
+        re.compile(r"stall\s*torque\s*[:\(]?\s*(\d+\.?\d*)\s*(?:kg[.-]?cm|n\.?m)"),
+    ],
+    "efficiency": [
+        re.compile(r"efficiency\s*[:\(]?\s*[>]?\s*(\d+)"),
+    ],
+    "shaft_diameter": [
+        re.compile(r"shaft\s*diameter\s*[:\(]?\s*(\d+\.?\d*)\s*mm"),
+    ],
+}
+
+
+def extract_via_regex(html_lower: str) -> dict[str, str]:
+    """Extract specifications using regex patterns on the lowercased page."""
     specs = {}
-    text = html.lower()
-
-    patterns = {
-        "weight_kg": [
-            r"weight\s*[:\(]?\s*(\d+\.?\d*)\s*kg",
-            r"(\d+\.?\d*)\s*kg\s*weight",
-        ],
-        "shipping_weight": [
-            r"shipping\s*weight\s*[:\s]*(\d+\.?\d*)\s*kg",
-        ],
-        "shipping_dimensions": [
-            r"shipping\s*dimensions?\s*[:\s]*([\d.]+\s*[×x]\s*[\d.]+\s*[×x]\s*[\d.]+)\s*cm",
-        ],
-        # Note: Voltage/Power/RPM regex removed - too many false positives from related products
-        # Rely on spec_table extraction instead
-        "rated_current": [
-            r"rated?\s*current\s*[:\(]?\s*[<>]?\s*(\d+\.?\d*)\s*a",
-        ],
-        "no_load_current": [
-            r"no\s*load\s*current\s*[:\(]?\s*[<>]?\s*(\d+\.?\d*)\s*a",
-        ],
-        "rated_torque": [
-            r"rated?\s*torque\s*[:\(]?\s*(\d+\.?\d*)\s*(?:kg[.-]?cm|n\.?m)",
-        ],
-        "stall_torque": [
-            r"stall\s*torque\s*[:\(]?\s*(\d+\.?\d*)\s*(?:kg[.-]?cm|n\.?m)",
-        ],
-        "efficiency": [
-            r"efficiency\s*[:\(]?\s*[>]?\s*(\d+)",
-        ],
-        "shaft_diameter": [
-            r"shaft\s*diameter\s*[:\(]?\s*(\d+\.?\d*)\s*mm",
-        ],
-    }
 
-    for key, pattern_list in patterns.items():
+    for key, pattern_list in REGEX_SPEC_PATTERNS.items():
         for pattern in pattern_list:
-            match = re.search(pattern, text)
+            match = pattern.search(html_lower)
             if match:
                 specs[key] = match.group(1)
                 break
@@ -292,10 +577,24 @@ def extract_via_regex(html: str) -> dict:
     return specs
 
 
-def scrape_product(url: str, verbose: bool = False) -> dict:
-    """Scrape specifications from a single product page."""
+def scrape_product(
+    url: str,
+    verbose: bool = False,
+    skip_duplicates: bool = False,
+    parse_pool: Executor | None = None,
+) -> Mapping[str, str]:
+    """Scrape specifications from a single product page.
+
+    With skip_duplicates, pages identical to one already scraped in this
+    process return a DuplicatePage without being parsed. With parse_pool
+    (e.g. a ProcessPoolExecutor), the page is parsed there instead of in
+    the calling thread.
+    """
     clean_url = url.rstrip("/")
-    spec_url = f"{clean_url}/#tab-specification"
+    # The spec tab is in the page source already, and a #fragment is never sent
+    # to the server. The trailing slash matches WordPress' canonical URL, which
+    # saves a redirect.
+    spec_url = f"{clean_url}/"
 
     if verbose:
         print(f"Fetching: {clean_url}")
@@ -306,19 +605,83 @@ def scrape_product(url: str, verbose: bool = False) -> dict:
             print(f"Failed to fetch: {spec_url}")
         return {}
 
-    soup = BeautifulSoup(html, "lxml")
-
-    product_name = extract_product_name(soup)
-    stock_status = extract_stock_status(soup)
-    price = extract_price(soup)
-    general_info = extract_general_info(soup)
-    spec_table = extract_specification_table(soup)
-    regex_specs = extract_via_regex(html)
+    original_url = find_duplicate_page(html, clean_url) if skip_duplicates else None
+    if original_url is not None:
+        if verbose:
+            print(f"Skipping duplicate of {original_url}: {clean_url}")
+        return DuplicatePage(clean_url, original_url)
+
+    if parse_pool is not None:
+        return parse_pool.submit(parse_product, html, clean_url).result()
+    return parse_product(html, clean_url)
+
+
+def create_parse_pool(processes: int) -> ProcessPoolExecutor:
+    """Create a process pool for the `parse_pool` argument of the scrapers.
+
+    The pool is filled from fetch threads, and forking a multithreaded process
+    can deadlock, so workers are started from a fork server where available.
+    """
+    mp_context = None
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        mp_context = multiprocessing.get_context("forkserver")
+    return ProcessPoolExecutor(max_workers=processes, mp_context=mp_context)
+
+
+# Unit handling in parse_product(), per field:
+#   (keywords, excluded, units, plain)
+# A spec applies when its key contains every keyword and no excluded word.
+# units are tried in order as (key markers, value markers, divisor). The first
+# unit with a marker in the key or value wins, and its number is divided by
+# divisor (None keeps the number as is). If the division fails, the next spec
+# is tried. A spec with no unit marker is taken as is when plain, else skipped.
+UNIT_RULES = {
+    "no_load_current": (
+        ("no", "load", "current"),
+        (),
+        ((("ma",), ("ma",), 1000),),
+        True,
+    ),
+    # Shipping weight and load weight (max load capacity) aren't the motor's weight
+    "weight": (
+        ("weight",),
+        ("shipping", "load"),
+        ((("(kg)",), ("kg",), None), (("(g)",), ("grams",), 1000)),
+        False,
+    ),
+}
 
-    # Merge all sources (spec_table takes priority, then general_info, then regex)
-    all_specs = {**regex_specs, **general_info, **spec_table}
 
-    def get_spec(*keys, clean=True, exact=False):
+def parse_product(html: str, url: str) -> dict[str, str]:
+    """Extract specifications from a fetched product page.
+
+    Module-level so it can be handed to a process pool.
+    """
+    tree = parse_html(html)
+
+    product_name = extract_product_name(tree)
+    stock_status = extract_stock_status(tree)
+    price = extract_price(tree)
+    general_info = extract_general_info(tree)
+    spec_table = extract_specification_table(tree)
+    regex_specs = extract_via_regex(html.lower())
+
+    # Merge all sources (spec_table takes priority, then general_info, then regex).
+    # regex_specs is ours, so it is filled in place; key order (which decides
+    # substring matches in get_spec) stays the same as building a new dict.
+    all_specs = regex_specs
+    all_specs.update(general_info)
+    all_specs.update(spec_table)
+
+    # Lowercase every key once instead of in each lookup. Exact matches go
+    # through a dict, keeping the first non-empty value for each key.
+    lowered_specs = [(spec_key.lower(), value) for spec_key, value in all_specs.items()]
+    exact_specs: dict[str, str] = {}
+    for spec_key, value in lowered_specs:
+        if value:
+            exact_specs.setdefault(spec_key, value)
+
+    def get_spec(*keys: str, clean: bool = True, exact: bool = False) -> str:
         """Get first matching key from specs.
         
         Args:
@@ -329,42 +692,47 @@ def scrape_product(url: str, verbose: bool = False) -> dict:
         for key in keys:
             key_lower = key.lower()
             # First try exact match
-            for spec_key, value in all_specs.items():
-                spec_key_lower = spec_key.lower()
-                if key_lower == spec_key_lower and value:
-                    if clean:
-                        return clean_number(value)
-                    return clean_value(value)
+            value = exact_specs.get(key_lower)
+            if value:
+                if clean:
+                    return clean_number(value)
+                return clean_value(value)
             
             # If no exact match and not requiring exact, try substring match
             if not exact:
-                for spec_key, value in all_specs.items():
-                    spec_key_lower = spec_key.lower()
-                    if (key_lower in spec_key_lower or spec_key_lower in key_lower) and value:
+                for spec_key, value in lowered_specs:
+                    if (key_lower in spec_key or spec_key in key_lower) and value:
                         if clean:
                             return clean_number(value)
                         return clean_value(value)
         return ""
 
-    # Helper to get spec with unit-aware extraction
-    def get_no_load_current():
-        """Get no-load current, handling mA vs A."""
-        # First try to find mA value
-        for spec_key, value in all_specs.items():
-            if "no" in spec_key.lower() and "load" in spec_key.lower() and "current" in spec_key.lower():
-                if "ma" in spec_key.lower() or "ma" in value.lower():
-                    # Convert mA to A
+    def get_with_unit(field: str) -> str | None:
+        """Get a number in the field's base unit (see UNIT_RULES), None if no spec matched."""
+        keywords, excluded, units, plain = UNIT_RULES[field]
+        for spec_key, value in lowered_specs:
+            if not all(word in spec_key for word in keywords):
+                continue
+            if any(word in spec_key for word in excluded):
+                continue
+            value_lower = value.lower()
+            for key_markers, value_markers, divisor in units:
+                if any(m in spec_key for m in key_markers) or any(m in value_lower for m in value_markers):
                     num = clean_number(value)
+                    if divisor is None:
+                        return num
                     if num:
                         try:
-                            return str(float(num) / 1000)
+                            return str(float(num) / divisor)
                         except ValueError:
                             pass
-                else:
+                    break
+            else:
+                if plain:
                     return clean_number(value)
-        return ""
+        return None
 
-    def get_efficiency():
+    def get_efficiency() -> str:
         """Get efficiency, handling ratio vs percentage."""
         val = get_spec("efficiency")
         if val:
@@ -377,33 +745,20 @@ def scrape_product(url: str, verbose: bool = False) -> dict:
                 return val
         return ""
 
-    def get_weight():
-        """Get weight, handling grams vs kg."""
-        # First try weight in kg
-        for spec_key, value in all_specs.items():
-            key_lower = spec_key.lower()
-            # Skip shipping weight and load weight (max load capacity, not motor weight)
-            if "weight" in key_lower and "shipping" not in key_lower and "load" not in key_lower:
-                # Check if value is in kg
-                if "(kg)" in key_lower or "kg" in value.lower():
-                    return clean_number(value)
-                # Check if value is in grams (only if explicitly marked)
-                if "(g)" in key_lower or "grams" in value.lower():
-                    num = clean_number(value)
-                    if num:
-                        try:
-                            return str(float(num) / 1000)
-                        except ValueError:
-                            pass
-        return get_spec("weight (kg)", "weight:", "weight_kg", exact=True)
+    def get_weight() -> str:
+        """Get weight in kg, falling back to an exact key match."""
+        weight = get_with_unit("weight")
+        if weight is None:
+            return get_spec("weight (kg)", "weight:", "weight_kg", exact=True)
+        return weight
 
-    def get_torque(torque_type: str):
+    def get_torque(torque_type: str) -> str:
         """Get torque, converting N-cm to kg-cm if needed."""
         # Look for torque with units
-        for spec_key, value in all_specs.items():
-            if torque_type in spec_key.lower():
+        for spec_key, value in lowered_specs:
+            if torque_type in spec_key:
                 # Check if it's in N-cm (Newton-cm)
-                if "(n-cm)" in spec_key.lower() or "n-cm" in value.lower() or "ncm" in value.lower():
+                if "(n-cm)" in spec_key or "n-cm" in value.lower() or "ncm" in value.lower():
                     num = clean_number(value)
                     if num:
                         try:
@@ -418,13 +773,13 @@ def scrape_product(url: str, verbose: bool = False) -> dict:
 
     result = {
         "Product Name": product_name,
-        "URL": clean_url,
+        "URL": url,
         "Stock Status": stock_status,
         "Price (INR)": price,
         "Voltage (V)": get_spec("rated voltage", "operating voltage", "voltage", "vdc"),
         "Power (W)": get_spec("operating power", "rated power", "power"),
         "Rated Current (A)": get_spec("rated current (a)", "rated current", "rate current"),
-        "No Load Current (A)": get_no_load_current(),
+        "No Load Current (A)": get_with_unit("no_load_current") or "",
         "Rated Torque (kg-cm)": get_torque("rated torque"),
         "Stall Torque (kg-cm)": get_torque("stall torque"),
         "RPM": get_spec("rated speed (rpm)", "rated speed", "speed (rpm)", "rpm"),
@@ -443,7 +798,32 @@ def scrape_product(url: str, verbose: bool = False) -> dict:
     return result
 
 
-def print_product_specs(specs: dict) -> None:
+def scrape_many(
+    urls: list[str], max_workers: int = 4, delay: float = 0.5, verbose: bool = False
+) -> list[Mapping[str, str]]:
+    """Scrape several product pages concurrently, returning results in input order.
+
+    Requests are paced to one per `delay` seconds across all workers, as in
+    the batch scrapers.
+    """
+    set_request_delay(delay, burst=max_workers)
+    # One pooled connection per worker on the shared session
+    enable_session_reuse(pool_size=max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda url: scrape_product(url, verbose=verbose), urls))
+
+
+def print_json(data: object) -> None:
+    """Print data as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2) + b"\n")
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(data, indent=2, ensure_ascii=False))
+
+
+def print_product_specs(specs: Mapping[str, str]) -> None:
     """Print product specifications in a readable format."""
     if not specs:
         print("No specifications found.")
@@ -460,13 +840,14 @@ def print_product_specs(specs: dict) -> None:
     print("=" * 60)
 
 
-def main():
+def main() -> None:
     parser = argparse.ArgumentParser(
-        description="Scrape specifications from a single robu.in product page"
+        description="Scrape specifications from robu.in product pages"
     )
     parser.add_argument(
         "url",
-        help="Product URL (e.g., https://robu.in/product/my6812-100w-dc-motor)",
+        nargs="+",
+        help="One or more product URLs (e.g., https://robu.in/product/my6812-100w-dc-motor)",
     )
     parser.add_argument(
         "--json",
@@ -479,16 +860,47 @@ def main():
         action="store_true",
         help="Show verbose output",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of pages fetched in parallel when given several URLs (default: 4)",
+    )
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=0.5,
+        help="Delay between requests in seconds when given several URLs (default: 0.5)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Cache fetched pages (gzipped) in this directory",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=3600,
+        help="Seconds a cached page stays fresh (default: 3600)",
+    )
 
     args = parser.parse_args()
 
-    specs = scrape_product(args.url, verbose=args.verbose)
+    if args.cache_dir:
+        enable_page_cache(args.cache_dir, ttl=args.cache_ttl)
+
+    if len(args.url) == 1:
+        results = [scrape_product(args.url[0], verbose=args.verbose)]
+    else:
+        results = scrape_many(
+            args.url, max_workers=args.workers, delay=args.delay, verbose=args.verbose
+        )
 
     if args.json:
-        import json
-        print(json.dumps(specs, indent=2))
+        # A single URL keeps printing a bare object
+        print_json(results[0] if len(results) == 1 else results)
     else:
-        print_product_specs(specs)
+        for specs in results:
+            print_product_specs(specs)
 
 
 if __name__ == "__main__":